@@ -3,8 +3,15 @@ from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout,
                            QHeaderView, QGroupBox, QFrame, QHBoxLayout)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor
+import numpy as np
+import pandas as pd
 import logging
 
+try:
+    import pyqtgraph as pg
+except ImportError:  # 未安装 pyqtgraph 时不显示行情图表
+    pg = None
+
 logger = logging.getLogger(__name__)
 
 class TurtleTraderGUI(QMainWindow):
@@ -68,10 +75,12 @@ class TurtleTraderGUI(QMainWindow):
         # 创建各个标签页
         self.create_summary_tab()
         self.create_trades_tab()
+        self.create_chart_tab()
         
         # 更新数据
         self.update_summary_info()
         self.update_trades_detail()
+        self.update_chart()
 
     def create_summary_tab(self):
         """创建交易概览标签页"""
@@ -269,6 +278,123 @@ class TurtleTraderGUI(QMainWindow):
         except Exception as e:
             logger.error(f"创建交易明细标签页失败: {str(e)}", exc_info=True)
 
+    def create_chart_tab(self):
+        """创建行情图表标签页"""
+        try:
+            tab = QWidget()
+            layout = QVBoxLayout()
+            layout.setContentsMargins(20, 20, 20, 20)
+            
+            if pg is None:
+                layout.addWidget(QLabel("未安装 pyqtgraph，无法显示行情图表"))
+                tab.setLayout(layout)
+                self.tabs.addTab(tab, "行情图表")
+                return
+            
+            pg.setConfigOptions(antialias=False, background='w', foreground='#2c3e50')
+            
+            # 上方为价格/通道/止损及买卖点，下方为N值，两者X轴联动
+            chart = pg.GraphicsLayoutWidget()
+            price_plot = chart.addPlot(row=0, col=0, axisItems={'bottom': pg.DateAxisItem(utcOffset=0)})
+            n_plot = chart.addPlot(row=1, col=0, axisItems={'bottom': pg.DateAxisItem(utcOffset=0)})
+            n_plot.setXLink(price_plot)
+            chart.ci.layout.setRowStretchFactor(0, 3)
+            chart.ci.layout.setRowStretchFactor(1, 1)
+            
+            price_plot.addLegend(offset=(10, 10))
+            price_plot.showGrid(x=True, y=True, alpha=0.3)
+            n_plot.showGrid(x=True, y=True, alpha=0.3)
+            n_plot.setLabel('left', 'N')
+            
+            # 按屏幕分辨率做峰值(min/max)抽稀，缩放时按可见范围重新采样，
+            # 长周期日线或分钟线只有可见部分的少量点进入渲染
+            for plot in (price_plot, n_plot):
+                plot.setDownsampling(auto=True, mode='peak')
+                plot.setClipToView(True)
+            
+            layout.addWidget(chart)
+            tab.setLayout(layout)
+            
+            # 保存引用
+            self.price_plot = price_plot
+            self.n_plot = n_plot
+            self.tabs.addTab(tab, "行情图表")
+            
+        except Exception as e:
+            logger.error(f"创建行情图表标签页失败: {str(e)}", exc_info=True)
+
+    def update_chart(self):
+        """更新行情图表"""
+        try:
+            if not hasattr(self, 'price_plot'):
+                return
+                
+            df = self.trader.df
+            if df is None or df.empty:
+                return
+            
+            # 交易日期转换为时间戳作为X轴
+            x = self.to_timestamps(df['trade_date'])
+            curves = [
+                (self.price_plot, 'close', "收盘价", pg.mkPen('#2c3e50', width=1)),
+                (self.price_plot, '20_high', "20日最高", pg.mkPen('#e74c3c', width=1)),
+                (self.price_plot, '20_low', "20日最低", pg.mkPen('#e74c3c', width=1, style=Qt.DashLine)),
+                (self.price_plot, '10_low', "10日最低", pg.mkPen('#27ae60', width=1, style=Qt.DashLine)),
+                (self.price_plot, 'stop', "止损价", pg.mkPen('#f39c12', width=2)),
+                (self.n_plot, 'N', None, pg.mkPen('#8e44ad', width=1)),
+            ]
+            # 峰值抽稀不处理NaN，含NaN的分组整体变为NaN，
+            # 因此按连续有效区间分段绘制（空仓时止损线为NaN）
+            for plot, column, name, pen in curves:
+                if column not in df:
+                    continue
+                y = df[column].to_numpy(dtype=float)
+                for start, end in self.finite_runs(y):
+                    plot.plot(x[start:end], y[start:end], pen=pen, name=name)
+                    name = None  # 图例只添加一次
+            
+            # 突破点
+            breakouts = self.trader.breakout_records
+            if breakouts:
+                self.price_plot.plot(
+                    self.to_timestamps([b.date for b in breakouts]),
+                    [b.price for b in breakouts],
+                    pen=None, symbol='o', symbolSize=6,
+                    symbolBrush='#3498db', symbolPen=None, name="20日突破"
+                )
+            
+            # 买入/卖出点
+            markers = [
+                ('BUY', 't1', '#e74c3c', "买入"),
+                ('SELL', 't', '#27ae60', "卖出"),
+            ]
+            for action, symbol, color, name in markers:
+                trades = [t for t in self.trader.trades_history if t.get('action') == action]
+                if not trades:
+                    continue
+                self.price_plot.plot(
+                    self.to_timestamps([t['date'] for t in trades]),
+                    [t['price'] for t in trades],
+                    pen=None, symbol=symbol, symbolSize=12,
+                    symbolBrush=color, symbolPen=None, name=name
+                )
+                
+        except Exception as e:
+            logger.error(f"更新行情图表失败: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def finite_runs(values):
+        """返回连续有效值区间的 (起始, 结束) 下标"""
+        finite = np.isfinite(values).astype(np.int8)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], finite, [0]))))
+        return list(zip(edges[::2], edges[1::2]))
+
+    @staticmethod
+    def to_timestamps(dates):
+        """将交易日期转换为Unix时间戳（秒）"""
+        dates = pd.to_datetime(pd.Series(dates).astype(str))
+        return (dates - pd.Timestamp(0)).dt.total_seconds().to_numpy()
+
     def update_summary_info(self):
         """更新交易概览信息"""
         try:
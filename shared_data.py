@@ -0,0 +1,77 @@
+from multiprocessing import shared_memory
+from collections import namedtuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 共享内存描述信息：体积很小，可直接传给子进程
+# columns 为 (列名, dtype字符串, 字节偏移) 元组
+PanelSpec = namedtuple('PanelSpec', ['name', 'length', 'columns'])
+
+class SharedDataPanel:
+    """共享内存行情面板
+
+    主进程将行情及指标数据一次性写入一块共享内存，子进程按名称挂载，
+    直接得到指向同一内存的 numpy 数组，无需逐任务序列化 DataFrame。
+    """
+
+    def __init__(self, shm, spec, owner):
+        self._shm = shm
+        self.spec = spec
+        self.owner = owner  # 是否为创建者（负责释放共享内存）
+        self.arrays = {}
+        for column, dtype, offset in spec.columns:
+            self.arrays[column] = np.ndarray(
+                (spec.length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset
+            )
+
+    @classmethod
+    def publish(cls, df, columns):
+        """将 DataFrame 的指定列发布到共享内存"""
+        data = [(column, np.ascontiguousarray(df[column].to_numpy())) for column in columns]
+        for column, values in data:
+            if values.dtype.hasobject:
+                raise TypeError(f"列 {column} 不是数值类型，无法放入共享内存")
+        
+        # 计算各列偏移，按8字节对齐
+        layout = []
+        offset = 0
+        for column, values in data:
+            layout.append((column, values.dtype.str, offset))
+            offset += (values.nbytes + 7) // 8 * 8
+        
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            spec = PanelSpec(shm.name, len(df), tuple(layout))
+            panel = cls(shm, spec, owner=True)
+            for column, values in data:
+                panel.arrays[column][:] = values
+        except Exception:
+            # 写入失败时立即释放，避免共享内存残留在 /dev/shm
+            panel = None  # 先释放数组视图，否则无法关闭映射
+            shm.close()
+            shm.unlink()
+            raise
+        
+        logger.debug(f"发布共享内存面板 {shm.name}: {len(df)} 行, {len(columns)} 列, {offset} 字节")
+        return panel
+
+    @classmethod
+    def attach(cls, spec):
+        """按名称挂载已发布的共享内存面板（零拷贝）"""
+        shm = shared_memory.SharedMemory(name=spec.name)
+        return cls(shm, spec, owner=False)
+
+    def close(self):
+        """释放本进程的映射，创建者同时删除共享内存"""
+        self.arrays = {}  # 先释放数组视图，否则无法关闭映射
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -3,9 +3,13 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
+import os
+from multiprocessing import util as mp_util
+from concurrent.futures import ProcessPoolExecutor
 from PyQt5.QtWidgets import QApplication
 import sys
 from gui import TurtleTraderGUI
+from shared_data import SharedDataPanel
 
 # 配置日志
 logging.basicConfig(
@@ -16,6 +20,15 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 参数扫描时发布到共享内存的列（OHLCV及预计算指标）
+PANEL_COLUMNS = [
+    'trade_date', 'open', 'high', 'low', 'close', 'vol',
+    'TR', 'N', '20_high', '20_low', '10_high', '10_low'
+]
+
+# 参数扫描支持覆盖的 TurtleTrader 属性
+SWEEP_PARAMS = {'initial_capital', 'unit_limit'}
+
 class BreakoutRecord:
     def __init__(self, date, price, N):
         self.date = date
@@ -26,13 +39,14 @@ class BreakoutRecord:
         self.min_price = price    # 记录突破后的最低价
 
 class TurtleTrader:
-    def __init__(self, initial_capital=550000):
+    def __init__(self, initial_capital=550000, connect=True):
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions = []  # 当前持仓
         self.trades_history = []  # 交易历史
         self.breakout_records = []  # 突破记录
         self.last_breakout = None   # 最后一次突破记录
+        self.df = None  # 回测所用行情及指标数据（供图表展示）
         
         # 设置回测参数
         self.start_date = '20230101'
@@ -43,10 +57,12 @@ class TurtleTrader:
         # 交易参数
         self.unit_limit = 4  # 最大持仓单位数
         
-        # 设置Tushare
-        ts.set_token('20240522230128-22019ddc-afa1-4905-89c9-8b822d27dc6b')
-        self.pro = ts.pro_api()
-        self.pro._DataApi__http_url = 'http://tsapi.majors.ltd:7000'
+        # 设置Tushare（参数扫描子进程只读共享内存，无需连接）
+        self.pro = None
+        if connect:
+            ts.set_token('20240522230128-22019ddc-afa1-4905-89c9-8b822d27dc6b')
+            self.pro = ts.pro_api()
+            self.pro._DataApi__http_url = 'http://tsapi.majors.ltd:7000'
         
     def record_breakout(self, date, price, N):
         """记录新的突破"""
@@ -137,22 +153,40 @@ class TurtleTrader:
         df['10_high'] = df['high'].rolling(window=10).max()
         df['10_low'] = df['low'].rolling(window=10).min()
         
+        # 执行交易循环，并记录每日止损线（供图表展示）
+        df['stop'] = self.backtest(df)
+        self.df = df
+
+        logger.info(f"策略运行完成，共进行 {len(self.trades_history)} 次交易")
+
+    def backtest(self, data):
+        """在行情数据上执行交易循环
+
+        data 为列名到数组的映射（DataFrame 或共享内存面板均可），
+        返回每个交易日收盘后的最高有效止损价
+        """
+        dates = np.asarray(data['trade_date'])
+        close = np.asarray(data['close'], dtype=float)
+        n_values = np.asarray(data['N'], dtype=float)
+        high_20 = np.asarray(data['20_high'], dtype=float)
+        low_10 = np.asarray(data['10_low'], dtype=float)
+        
         last_entry_price = None  # 记录最后一次入市价格
+        stop_levels = np.full(len(close), np.nan)
         
         # 遍历数据进行交易
-        for i in range(20, len(df)):
-            current_row = df.iloc[i]
-            prev_row = df.iloc[i-1]
+        for i in range(20, len(close)):
+            current_row = {'trade_date': dates[i], '10_low': low_10[i]}
             
-            current_price = current_row['close']
-            current_date = current_row['trade_date']
-            N = current_row['N']
+            current_price = close[i]
+            current_date = dates[i]
+            N = n_values[i]
             
             # 更新现有突破的状态
             self.update_breakout_status(current_price, current_row)
             
             # 检查20日突破
-            if current_price > prev_row['20_high']:
+            if current_price > high_20[i-1]:
                 # 记录新的突破
                 breakout = self.record_breakout(current_date, current_price, N)
                 logger.info(f"检测到20日突破 - 日期:{current_date} 价格:{current_price:.2f}")
@@ -177,8 +211,45 @@ class TurtleTrader:
             
             # 检查退出条件
             self.check_exits(current_price, current_date, current_row, N)
+            
+            # 记录当日止损线
+            stop_levels[i] = max((pos.stop_loss for pos in self.positions), default=np.nan)
+        
+        return stop_levels
 
-        logger.info(f"策略运行完成，共进行 {len(self.trades_history)} 次交易")
+    def run_parameter_sweep(self, param_grid, processes=None):
+        """多进程参数扫描
+
+        OHLCV及预计算指标（PANEL_COLUMNS）只发布一次到共享内存，
+        各子进程启动时按名称挂载一次，逐任务回测并仅返回精简的结果记录。
+        param_grid 为参数字典列表，键须属于 SWEEP_PARAMS。
+        """
+        param_grid = list(param_grid)
+        for params in param_grid:
+            unknown = set(params) - SWEEP_PARAMS
+            if unknown:
+                raise ValueError(f"不支持的扫描参数: {', '.join(sorted(unknown))}")
+        
+        df = self.get_stock_data(self.stock_code)
+        if df is None or len(df) < 20:
+            logger.error("数据获取失败或数据量不足")
+            return []
+        
+        # 日期转为整数，使所有列都能放入共享内存
+        df = df.assign(trade_date=df['trade_date'].astype('int64'))
+        processes = processes or os.cpu_count() or 1
+        chunksize = max(1, len(param_grid) // (processes * 4))
+        
+        with SharedDataPanel.publish(df, PANEL_COLUMNS) as panel:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_sweep_worker,
+                initargs=(panel.spec,)
+            ) as pool:
+                results = list(pool.map(_sweep_worker, param_grid, chunksize=chunksize))
+        
+        logger.info(f"参数扫描完成，共 {len(results)} 组参数")
+        return results
 
     def show_gui(self):
         """显示GUI界面"""
@@ -307,6 +378,33 @@ class TurtleTrader:
             logger.error(f"退出交易失败: {str(e)}")
             return False
 
+# 参数扫描子进程挂载的共享内存面板（每个进程一份）
+_worker_panel = None
+
+def _init_sweep_worker(spec):
+    """参数扫描子进程初始化：挂载一次共享内存面板，进程退出时释放"""
+    global _worker_panel
+    logger.setLevel(logging.WARNING)  # 避免逐笔交易日志淹没输出
+    _worker_panel = SharedDataPanel.attach(spec)
+    mp_util.Finalize(None, _worker_panel.close, exitpriority=10)
+
+def _sweep_worker(params):
+    """参数扫描子进程：在已挂载的面板上回测一组参数"""
+    trader = TurtleTrader(connect=False)
+    for key, value in params.items():
+        setattr(trader, key, value)
+    trader.cash = trader.initial_capital
+    trader.backtest(_worker_panel.arrays)
+    
+    position_value = sum(pos.shares * pos.entry_price for pos in trader.positions)
+    return {
+        **params,
+        'final_value': float(trader.cash + position_value),
+        'total_profit': float(sum(t.get('profit', 0) for t in trader.trades_history)),
+        'trade_count': len(trader.trades_history),
+        'open_positions': len(trader.positions),
+    }
+
 class Position:
     def __init__(self, entry_date, entry_price, shares, stop_loss):
         self.entry_date = entry_date